@@ -1,5 +1,5 @@
 -- Context Engine Database Schema v1.2.0
--- SQLite schema for rules, chatlogs, and sequences
+-- SQLite schema for rules, rule tags, chatlogs, and sequences
 -- Generated by schema_generator.py from build/modules/build-schema-database.yaml
 
 -- ============================================================================
@@ -54,6 +54,13 @@ CREATE TABLE rule_relationships (
   PRIMARY KEY(from_rule, to_rule, relationship_type)
 );
 
+-- Rule tags: One row per tag in rules.tags, kept in sync by triggers
+CREATE TABLE rule_tags (
+  rule_id TEXT NOT NULL,
+  tag TEXT NOT NULL,
+  FOREIGN KEY(rule_id) REFERENCES rules(id) ON DELETE CASCADE
+);
+
 -- Schema_metadata table
 CREATE TABLE schema_metadata (
   key TEXT PRIMARY KEY,
@@ -117,6 +124,11 @@ CREATE INDEX idx_rules_tags_state ON rules(tags_state);
 CREATE INDEX idx_rules_lifecycle ON rules(lifecycle);
 CREATE INDEX idx_rules_chatlog ON rules(chatlog_id);
 CREATE INDEX idx_rules_confidence ON rules(confidence);
+CREATE INDEX idx_rules_tagged ON rules(id) WHERE tags IS NOT NULL AND tags != '[]';
+
+-- Rule_tags table indexes
+CREATE INDEX idx_rule_tags_tag ON rule_tags(tag);
+CREATE INDEX idx_rule_tags_rule ON rule_tags(rule_id);
 
 -- Chatlogs table indexes
 CREATE INDEX idx_chatlogs_timestamp ON chatlogs(timestamp);
@@ -127,6 +139,31 @@ CREATE INDEX idx_relationships_from ON rule_relationships(from_rule);
 CREATE INDEX idx_relationships_to ON rule_relationships(to_rule);
 CREATE INDEX idx_relationships_type ON rule_relationships(relationship_type);
 
+-- ============================================================================
+-- TRIGGERS
+-- ============================================================================
+
+-- Keep rule_tags in sync with the rules.tags JSON array
+CREATE TRIGGER trg_rules_tags_insert AFTER INSERT ON rules
+BEGIN
+  INSERT INTO rule_tags (rule_id, tag)
+  SELECT NEW.id, value FROM json_each(CASE WHEN json_valid(NEW.tags) THEN NEW.tags END)
+  WHERE value IS NOT NULL;
+END;
+
+CREATE TRIGGER trg_rules_tags_update AFTER UPDATE OF id, tags ON rules
+BEGIN
+  DELETE FROM rule_tags WHERE rule_id = OLD.id;
+  INSERT INTO rule_tags (rule_id, tag)
+  SELECT NEW.id, value FROM json_each(CASE WHEN json_valid(NEW.tags) THEN NEW.tags END)
+  WHERE value IS NOT NULL;
+END;
+
+CREATE TRIGGER trg_rules_tags_delete AFTER DELETE ON rules
+BEGIN
+  DELETE FROM rule_tags WHERE rule_id = OLD.id;
+END;
+
 -- ============================================================================
 -- INITIAL DATA
 -- ============================================================================
@@ -7,7 +7,6 @@ Generated from: specs/modules/runtime-script-vocabulary-curation-v1.2.0.yaml
 """
 
 import sys
-import json
 import sqlite3
 from pathlib import Path
 
@@ -18,6 +17,13 @@ if sys.version_info < (3, 8):
 
 import yaml
 
+from vocabulary_curation import (
+    YAML_DUMPER,
+    YAML_LOADER,
+    detect_typos,
+    load_vocabulary,
+)
+
 # INV-021: Absolute paths only - read from config
 # First, determine config path relative to this script
 SCRIPT_DIR = Path(__file__).parent
@@ -26,7 +32,7 @@ CONFIG_PATH = BASE_DIR / "config" / "deployment.yaml"
 
 # Load config to get project root and context engine home
 with open(CONFIG_PATH) as f:
-    _config = yaml.safe_load(f)
+    _config = yaml.load(f, Loader=YAML_LOADER)
     PROJECT_ROOT = Path(_config['paths']['project_root'])
     # Read context_engine_home from config - allows .context-engine to be placed anywhere
     BASE_DIR = Path(_config['paths']['context_engine_home'])
@@ -34,9 +40,8 @@ with open(CONFIG_PATH) as f:
 
 def load_config():
     """Load deployment configuration and vocabulary."""
-    with open(CONFIG_PATH) as f:
-        config = yaml.safe_load(f)
-    return config
+    # Already parsed once at import time to resolve BASE_DIR
+    return _config
 
 
 # ============================================================================
@@ -44,98 +49,28 @@ def load_config():
 # ============================================================================
 
 
-def get_database_statistics(db_path):
-    """VOCAB-038: Query database statistics using shared helper function."""
-    conn = sqlite3.connect(str(db_path))
+def count_rules(conn):
+    """VOCAB-038: Count rules without touching the database schema.
+
+    tags-check only reads the database, so it does not run the rule_tags
+    migration that get_database_statistics depends on.
+    """
     cursor = conn.cursor()
 
-    # Total rules
     cursor.execute("SELECT COUNT(*) FROM rules")
-    total_rules = cursor.fetchone()[0]
-
-    # Rules with non-empty tags
-    cursor.execute("SELECT COUNT(*) FROM rules WHERE tags IS NOT NULL AND tags != '[]'")
-    tagged_rules = cursor.fetchone()[0]
-
-    # Unique tags (requires JSON extraction)
-    try:
-        cursor.execute("""
-            SELECT COUNT(DISTINCT json_each.value)
-            FROM rules, json_each(rules.tags)
-            WHERE rules.tags IS NOT NULL AND rules.tags != '[]'
-        """)
-        unique_tags = cursor.fetchone()[0]
-    except sqlite3.OperationalError:
-        unique_tags = 0
-
-    conn.close()
-
-    return {
-        'total_rules': total_rules,
-        'tagged_rules': tagged_rules,
-        'unique_tags': unique_tags
-    }
-
-
-def levenshtein_distance(s1, s2):
-    """Calculate Levenshtein edit distance between two strings."""
-    if len(s1) < len(s2):
-        return levenshtein_distance(s2, s1)
-
-    if len(s2) == 0:
-        return len(s1)
-
-    previous_row = range(len(s2) + 1)
-    for i, c1 in enumerate(s1):
-        current_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            # j+1 instead of j since previous_row and current_row are one character longer than s2
-            insertions = previous_row[j + 1] + 1
-            deletions = current_row[j] + 1
-            substitutions = previous_row[j] + (c1 != c2)
-            current_row.append(min(insertions, deletions, substitutions))
-        previous_row = current_row
+    return cursor.fetchone()[0]
 
-    return previous_row[-1]
 
-
-def check_untagged_count(db_path):
+def check_untagged_count(conn):
     """VOCAB-030: Check reports count of untagged rules."""
-    conn = sqlite3.connect(str(db_path))
     cursor = conn.cursor()
 
     cursor.execute("SELECT COUNT(*) FROM rules WHERE tags_state = 'needs_tags'")
-    count = cursor.fetchone()[0]
-
-    conn.close()
-    return count
-
-
-def check_typos(vocab_path):
-    """VOCAB-031: Check reports obvious typos (edit distance = 1)."""
-    with open(vocab_path) as f:
-        vocab = yaml.safe_load(f)
-
-    tier_2_tags = vocab.get('tier_2_tags', {})
-    typos = []
+    return cursor.fetchone()[0]
 
-    # Compare all tier-2 tags within each domain
-    for domain, tags in tier_2_tags.items():
-        if not tags:
-            continue
-        for i, tag1 in enumerate(tags):
-            for tag2 in tags[i+1:]:
-                if levenshtein_distance(tag1, tag2) == 1:
-                    typos.append((domain, tag1, tag2))
 
-    return typos
-
-
-def validate_vocabulary_schema(vocab_path):
+def validate_vocabulary_schema(vocab, vocab_path):
     """VOCAB-033: tags-check validates vocabulary schema structure for tier_1/tier_2 consistency."""
-    with open(vocab_path) as f:
-        vocab = yaml.safe_load(f)
-
     tier_1_domains = vocab.get('tier_1_domains', {})
     tier_2_tags = vocab.get('tier_2_tags', {})
 
@@ -160,7 +95,7 @@ def validate_vocabulary_schema(vocab_path):
 
         # Save updated vocabulary
         with open(vocab_path, 'w') as f:
-            yaml.dump(vocab, f, default_flow_style=False, sort_keys=False, indent=2, allow_unicode=True)
+            yaml.dump(vocab, f, Dumper=YAML_DUMPER, default_flow_style=False, sort_keys=False, indent=2, allow_unicode=True)
 
     return {
         'tier1_valid': tier1_valid,
@@ -188,15 +123,24 @@ def main():
     vocab_path = BASE_DIR / "config" / "tag-vocabulary.yaml"
     db_path = Path(config['structure']['database_path'])
 
+    # Load vocabulary once for schema validation and typo checks
+    vocab = load_vocabulary(vocab_path)
+
     # Validate schema (VOCAB-033)
-    schema_validation = validate_vocabulary_schema(vocab_path)
+    schema_validation = validate_vocabulary_schema(vocab, vocab_path)
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        # Get database statistics (VOCAB-038)
+        total_rules = count_rules(conn)
 
-    # Get database statistics (VOCAB-038)
-    stats = get_database_statistics(db_path)
+        # Check for issues
+        untagged_count = check_untagged_count(conn)
+    finally:
+        conn.close()
 
-    # Check for issues
-    untagged_count = check_untagged_count(db_path)
-    typos = check_typos(vocab_path)
+    # VOCAB-031: Check reports obvious typos (edit distance = 1)
+    typos = detect_typos(vocab)
 
     # VOCAB-037: Report schema validation results explicitly
     print("\nSchema Validation:")
@@ -207,7 +151,7 @@ def main():
 
     # Database statistics
     print("\nDatabase Statistics:")
-    print(f"  Total rules: {stats['total_rules']}")
+    print(f"  Total rules: {total_rules}")
     print(f"  Untagged rules: {untagged_count}")
     print(f"  Typos detected: {len(typos)}\n")
 
@@ -7,10 +7,9 @@ Generated from: specs/modules/runtime-script-tag-optimization-v1.5.11.yaml
 """
 
 import sys
-import json
 import sqlite3
+from itertools import takewhile
 from pathlib import Path
-from collections import Counter
 
 # INV-023: Check Python version
 if sys.version_info < (3, 8):
@@ -19,6 +18,8 @@ if sys.version_info < (3, 8):
 
 import yaml
 
+from vocabulary_curation import YAML_LOADER, ensure_rule_tags
+
 # INV-021: Absolute paths only - read from config
 # First, determine config path relative to this script
 SCRIPT_DIR = Path(__file__).parent
@@ -27,7 +28,7 @@ CONFIG_PATH = BASE_DIR / "config" / "deployment.yaml"
 
 # Load config to get project root and context engine home
 with open(CONFIG_PATH) as f:
-    _config = yaml.safe_load(f)
+    _config = yaml.load(f, Loader=YAML_LOADER)
     PROJECT_ROOT = Path(_config['paths']['project_root'])
     # Read context_engine_home from config - allows .context-engine to be placed anywhere
     BASE_DIR = Path(_config['paths']['context_engine_home'])
@@ -35,9 +36,8 @@ with open(CONFIG_PATH) as f:
 
 def load_config():
     """Load deployment configuration."""
-    with open(CONFIG_PATH) as f:
-        config = yaml.safe_load(f)
-    return config
+    # Already parsed once at import time to resolve BASE_DIR
+    return _config
 
 
 def main():
@@ -58,104 +58,124 @@ def main():
 
     # Connect to database
     conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
     cursor = conn.cursor()
 
-    # OPT-074: Check if any tagged rules exist
-    cursor.execute("SELECT COUNT(*) FROM rules WHERE tags IS NOT NULL AND tags != '[]'")
-    tagged_count = cursor.fetchone()[0]
-
-    if tagged_count == 0:
-        # OPT-074: Empty-state reporting
-        cursor.execute("SELECT COUNT(*) FROM rules")
-        total_rules = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM rules WHERE tags_state = 'needs_tags'")
-        needs_tags_count = cursor.fetchone()[0]
+    try:
+        # rule_tags and idx_rules_tagged from schema/schema.sql back the counts
+        # below; created here for databases initialized before them
+        ensure_rule_tags(conn)
+
+        # Everything after the migration check only reads
+        conn.execute("PRAGMA query_only=1")
+
+        # OPT-074: Check if any tagged rules exist; all three counts come back in
+        # one statement, each subquery answered from its own index
+        cursor.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM rules WHERE tags IS NOT NULL AND tags != '[]'),
+                (SELECT COUNT(*) FROM rules),
+                (SELECT COUNT(*) FROM rules WHERE tags_state = 'needs_tags')
+        """)
+        tagged_count, total_rules, needs_tags_count = cursor.fetchone()
+
+        if tagged_count == 0:
+            # OPT-074: Empty-state reporting
+            print("")
+            print("No tagged rules in database.")
+            print("")
+            print(f"Database contains {total_rules} rules, {needs_tags_count} awaiting tag optimization.")
+            print("")
+
+            # Guidance message
+            if total_rules == 0:
+                print("Run 'make chatlogs-extract' to import rules from chatlogs first.")
+            elif needs_tags_count > 0:
+                print("Run 'make tags-optimize' or 'make tags-optimize-auto' to begin tagging.")
+            else:
+                print("All rules have empty tag lists. Check database integrity.")
+
+            return 0
+
+        # OPT-012: Track tag reuse frequency across database
+        # Counted from the rule_tags index so tag arrays are never decoded
+        cursor.execute("""
+            SELECT tag, COUNT(*) AS usage_count
+            FROM rule_tags
+            GROUP BY tag
+            ORDER BY usage_count DESC, tag ASC
+        """)
+
+        # OPT-013: Tag distribution histogram
+        tag_counts = dict(cursor.fetchall())
+
+        # OPT-018a: Top 30 most frequent tags
+        top_tags = list(tag_counts.items())[:30]
+
+        # OPT-018b: Summary statistics
+        total_unique_tags = len(tag_counts)
+        total_tag_instances = sum(tag_counts.values())
 
         print("")
-        print("No tagged rules in database.")
-        print("")
-        print(f"Database contains {total_rules} rules, {needs_tags_count} awaiting tag optimization.")
+        print(f"Total unique tags: {total_unique_tags}")
+        print(f"Total tag instances: {total_tag_instances}")
+        print(f"Average tags per rule: {total_tag_instances / tagged_count:.1f}")
         print("")
 
-        # Guidance message
-        if total_rules == 0:
-            print("Run 'make chatlogs-extract' to import rules from chatlogs first.")
-        elif needs_tags_count > 0:
-            print("Run 'make tags-optimize' or 'make tags-optimize-auto' to begin tagging.")
-        else:
-            print("All rules have empty tag lists. Check database integrity.")
-
-        conn.close()
-        return 0
-
-    # OPT-012: Track tag reuse frequency across database
-    cursor.execute("SELECT tags FROM rules WHERE tags IS NOT NULL AND tags != '[]'")
-    all_tags = []
+        # OPT-018: Visual bar chart of tag frequency distribution
+        if top_tags:
+            max_count = top_tags[0][1]
+            bar_width = 50  # Maximum bar width in characters
+            full_bar = '█' * bar_width
 
-    for row in cursor.fetchall():
-        tags_str = row[0]
-        try:
-            tags = json.loads(tags_str)
-            all_tags.extend(tags)
-        except json.JSONDecodeError:
-            continue
+            print("Top 30 Most Frequent Tags:")
+            print("")
 
-    # OPT-013: Tag distribution histogram
-    tag_counts = Counter(all_tags)
+            lines = []
+            for tag, count in top_tags:
+                # Calculate proportional bar length; integer math avoids float
+                # rounding pushing an exact multiple below the next bar step
+                bar_length = count * bar_width // max_count if max_count > 0 else 0
+                bar = full_bar[:bar_length]
 
-    # OPT-018a: Top 30 most frequent tags
-    top_tags = tag_counts.most_common(30)
+                # Format with tag name, bar, and count
+                lines.append(f"  {tag:30s} {bar:50s} {count:4d}")
 
-    # OPT-018b: Summary statistics
-    total_unique_tags = len(tag_counts)
-    total_tag_instances = sum(tag_counts.values())
+            # Emit the chart in one write rather than one print per row
+            print("\n".join(lines))
 
-    print("")
-    print(f"Total unique tags: {total_unique_tags}")
-    print(f"Total tag instances: {total_tag_instances}")
-    print(f"Average tags per rule: {total_tag_instances / tagged_count:.1f}")
-    print("")
-
-    # OPT-018: Visual bar chart of tag frequency distribution
-    if top_tags:
-        max_count = top_tags[0][1]
-        bar_width = 50  # Maximum bar width in characters
-
-        print("Top 30 Most Frequent Tags:")
+        # OPT-014: Identify low-frequency tags for review
+        print("")
+        print("Low-Frequency Tags (used 1-2 times):")
         print("")
 
-        for tag, count in top_tags:
-            # Calculate proportional bar length
-            bar_length = int((count / max_count) * bar_width) if max_count > 0 else 0
-            bar = '█' * bar_length
-
-            # Format with tag name, bar, and count
-            print(f"  {tag:30s} {bar:50s} {count:4d}")
-
-    # OPT-014: Identify low-frequency tags for review
-    print("")
-    print("Low-Frequency Tags (used 1-2 times):")
-    print("")
+        # Counts arrive in descending order, so low-frequency tags are the
+        # tail of tag_counts; walk it from the end and stop at the first
+        # frequent tag
+        low_freq_tags = list(takewhile(lambda x: x[1] <= 2, reversed(tag_counts.items())))
+        low_freq_tags.sort(key=lambda x: (x[1], x[0]))  # Sort by count, then alphabetically
 
-    low_freq_tags = [(tag, count) for tag, count in tag_counts.items() if count <= 2]
-    low_freq_tags.sort(key=lambda x: (x[1], x[0]))  # Sort by count, then alphabetically
+        if low_freq_tags:
+            # Show first 20 low-frequency tags
+            print("\n".join(
+                f"  {tag:30s} ({count} use{'s' if count > 1 else ''})"
+                for tag, count in low_freq_tags[:20]
+            ))
 
-    if low_freq_tags:
-        # Show first 20 low-frequency tags
-        for tag, count in low_freq_tags[:20]:
-            print(f"  {tag:30s} ({count} use{'s' if count > 1 else ''})")
+            if len(low_freq_tags) > 20:
+                print(f"  ... and {len(low_freq_tags) - 20} more")
 
-        if len(low_freq_tags) > 20:
-            print(f"  ... and {len(low_freq_tags) - 20} more")
+            print("")
+            print(f"Total low-frequency tags: {len(low_freq_tags)} ({len(low_freq_tags)/total_unique_tags*100:.1f}% of unique tags)")
+        else:
+            print("  (none)")
 
-        print("")
-        print(f"Total low-frequency tags: {len(low_freq_tags)} ({len(low_freq_tags)/total_unique_tags*100:.1f}% of unique tags)")
-    else:
-        print("  (none)")
+        return 0
 
-    conn.close()
-    return 0
+    finally:
+        conn.close()
 
 
 if __name__ == '__main__':
@@ -7,12 +7,14 @@ Generated from: build/modules/runtime-command-chatlog-capture.yaml v1.14.1
 """
 
 import sys
+import calendar
+import functools
 import json
+import os
 import re
-import uuid
-from datetime import datetime
+import time
+from collections.abc import Hashable
 from pathlib import Path
-import difflib
 import argparse
 
 # INV-023: Check Python version
@@ -22,6 +24,48 @@ if sys.version_info < (3, 8):
 
 import yaml
 
+# Prefer the LibYAML C bindings; fall back to the pure-Python safe classes
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+UUID_V4_PATTERN = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}')
+
+# Field grammar datetime.strptime applies to '%Y-%m-%dT%H:%M:%SZ'
+TIMESTAMP_PATTERN = re.compile(
+    r'(\d\d\d\d)-(1[0-2]|0[1-9]|[1-9])-(3[01]|[12]\d|0[1-9]|[1-9]| [1-9])'
+    r'T(?:2[0-3]|[0-1]\d|\d):(?:[0-5]\d|\d):(6[0-1]|[0-5]\d|\d)Z',
+    re.IGNORECASE
+)
+
+# CAP-040a: Required top-level fields, and those whose absence stops validation
+REQUIRED_TOP_LEVEL_FIELDS = (
+    'chatlog_id', 'schema_version', 'timestamp', 'agent',
+    'session_duration_minutes', 'rules', 'session_context', 'artifacts'
+)
+CRITICAL_TOP_LEVEL_FIELDS = frozenset(('chatlog_id', 'schema_version', 'timestamp', 'rules'))
+
+# CAP-023: Fields every rule carries
+REQUIRED_RULE_FIELDS = ('topic', 'rationale', 'domain', 'confidence')
+
+# CAP-040f, CAP-040g: Extra fields per rule category, with the rule kind
+# named in missing-field messages
+CATEGORY_RULE_FIELDS = {
+    'decisions': ('decision', ('alternatives_rejected', 'context_when_applies', 'context_when_not', 'tradeoffs')),
+    'constraints': ('constraint', ('validation_method',)),
+    'invariants': ('invariant', ()),
+}
+
+# CAP-062: Temporal language markers with the name each is reported under,
+# checked in order (first hit wins)
+TEMPORAL_PATTERNS = (
+    ('was ', 'was'),
+    ('were ', 'were'),
+    ('Phase ', 'Phase'),
+    ('completed', 'completed'),
+    ('during ', 'during'),
+    ('after ', 'after'),
+)
+
 # INV-021: Absolute paths only - read from config
 # First, determine config path relative to this script
 SCRIPT_DIR = Path(__file__).parent
@@ -30,39 +74,48 @@ CONFIG_PATH = BASE_DIR / "config" / "deployment.yaml"
 
 # Load config to get project root and context engine home
 with open(CONFIG_PATH) as f:
-    _config = yaml.safe_load(f)
+    _config = yaml.load(f, Loader=YAML_LOADER)
     PROJECT_ROOT = Path(_config['paths']['project_root'])
     # Read context_engine_home from config - allows .context-engine to be placed anywhere
     BASE_DIR = Path(_config['paths']['context_engine_home'])
 
 
+@functools.lru_cache(maxsize=4)
+def _load_domain_tags(vocab_path, mtime_ns):
+    """Parse tier-1 domains from the vocabulary file, once per file version."""
+    with open(vocab_path) as f:
+        vocabulary = yaml.load(f, Loader=YAML_LOADER)
+
+    return tuple(vocabulary['tier_1_domains'].keys())
+
+
 def load_config():
     """Load deployment configuration and vocabulary.
 
     Implements CAP-066: Validator loads vocabulary file from deployment config.
     """
-    with open(CONFIG_PATH) as f:
-        config = yaml.safe_load(f)
+    # Deployment config was already parsed at import time to resolve BASE_DIR
+    config = dict(_config)
 
     # Load tag vocabulary (CAP-066)
+    # Reparsed only when the file changes, for callers that load config repeatedly
     vocab_path = BASE_DIR / config.get('vocabulary_file', 'config/tag-vocabulary.yaml')
-    with open(vocab_path) as f:
-        vocabulary = yaml.safe_load(f)
+    domain_tags = _load_domain_tags(str(vocab_path), os.stat(vocab_path).st_mtime_ns)
 
     # CAP-066: Use domain strings as-is from vocabulary (no normalization)
     # v1.14.1: CAP-067 removed - domains are not Python identifiers
-    config['domain_tags'] = list(vocabulary['tier_1_domains'].keys())
+    config['domain_tags'] = list(domain_tags)
+    # Membership checks go through a set; the list keeps vocabulary order for messages
+    config['domain_tags_set'] = frozenset(config['domain_tags'])
 
     return config
 
 
 def validate_uuid(value):
     """Validate UUID v4 format (CAP-040b)."""
-    try:
-        uuid_obj = uuid.UUID(value, version=4)
-        return str(uuid_obj) == value
-    except (ValueError, AttributeError):
-        return False
+    # Canonical lowercase form with the v4 version nibble and RFC 4122 variant,
+    # i.e. exactly the strings that round-trip through uuid.UUID(version=4)
+    return isinstance(value, str) and UUID_V4_PATTERN.fullmatch(value) is not None
 
 
 def validate_timestamp(value):
@@ -71,15 +124,20 @@ def validate_timestamp(value):
         return False
     if not value.endswith('Z'):
         return False
-    try:
-        datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ')
-        return True
-    except ValueError:
+    match = TIMESTAMP_PATTERN.fullmatch(value)
+    if match is None:
         return False
+    # Range checks the pattern cannot express, without building a datetime
+    year, month, day, second = (int(field) for field in match.groups())
+    return year >= 1 and day <= calendar.monthrange(year, month)[1] and second <= 59
 
 
 def validate_confidence(value):
     """Validate confidence is in [0.0, 1.0] range (CAP-040e)."""
+    # YAML floats need no conversion
+    if type(value) is float:
+        return 0.0 <= value <= 1.0
+
     try:
         conf = float(value)
         return 0.0 <= conf <= 1.0
@@ -105,11 +163,7 @@ def validate_schema(chatlog, config, debug_mode=False):
     warnings = []
 
     # CAP-040a: Required top-level fields
-    required_fields = [
-        'chatlog_id', 'schema_version', 'timestamp', 'agent',
-        'session_duration_minutes', 'rules', 'session_context', 'artifacts'
-    ]
-    for field in required_fields:
+    for field in REQUIRED_TOP_LEVEL_FIELDS:
         if field not in chatlog:
             errors.append({
                 'category': 'top_level',
@@ -119,7 +173,7 @@ def validate_schema(chatlog, config, debug_mode=False):
             })
 
     # If missing critical fields, return early
-    if any(err['field'] in ['chatlog_id', 'schema_version', 'timestamp', 'rules'] for err in errors):
+    if any(err['field'] in CRITICAL_TOP_LEVEL_FIELDS for err in errors):
         return errors, warnings
 
     # CAP-040b: Validate chatlog_id is UUID v4
@@ -154,9 +208,7 @@ def validate_schema(chatlog, config, debug_mode=False):
 
     # Collect all rules for validation
     all_rules = []
-    rule_categories = ['decisions', 'constraints', 'invariants']
-
-    for category in rule_categories:
+    for category, (rule_kind, category_fields) in CATEGORY_RULE_FIELDS.items():
         if category not in chatlog['rules']:
             continue
 
@@ -173,8 +225,7 @@ def validate_schema(chatlog, config, debug_mode=False):
             all_rules.append((category, idx, rule))
 
             # CAP-023: Each rule has required fields
-            required_rule_fields = ['topic', 'rationale', 'domain', 'confidence']
-            for field in required_rule_fields:
+            for field in REQUIRED_RULE_FIELDS:
                 if field not in rule:
                     errors.append({
                         'category': category,
@@ -186,7 +237,9 @@ def validate_schema(chatlog, config, debug_mode=False):
 
             # CAP-040d: Validate domain is in allowed list
             if 'domain' in rule:
-                if rule['domain'] not in config['domain_tags']:
+                # Unhashable values (lists, mappings) can never be a vocabulary key
+                domain = rule['domain']
+                if not isinstance(domain, Hashable) or domain not in config['domain_tags_set']:
                     errors.append({
                         'category': category,
                         'index': idx,
@@ -206,35 +259,22 @@ def validate_schema(chatlog, config, debug_mode=False):
                         'message': f"Rule at {category} index {idx}: confidence must be in [0.0, 1.0], got: {rule['confidence']}"
                     })
 
-            # CAP-040f: Decisions have decision-specific fields
-            if category == 'decisions':
-                decision_fields = ['alternatives_rejected', 'context_when_applies', 'context_when_not', 'tradeoffs']
-                for field in decision_fields:
-                    if field not in rule:
-                        errors.append({
-                            'category': category,
-                            'index': idx,
-                            'field': field,
-                            'error_type': 'missing_field',
-                            'message': f"Rule at {category} index {idx}: Missing decision field '{field}'"
-                        })
-
-            # CAP-040g: Constraints have constraint-specific fields
-            if category == 'constraints':
-                if 'validation_method' not in rule:
+            # CAP-040f, CAP-040g: Decisions and constraints have category-specific fields
+            for field in category_fields:
+                if field not in rule:
                     errors.append({
                         'category': category,
                         'index': idx,
-                        'field': 'validation_method',
+                        'field': field,
                         'error_type': 'missing_field',
-                        'message': f"Rule at {category} index {idx}: Missing constraint field 'validation_method'"
+                        'message': f"Rule at {category} index {idx}: Missing {rule_kind} field '{field}'"
                     })
 
     # CAP-040i: Debug mode - warn about domains not in current vocabulary
     if debug_mode:
-        vocabulary_domains = set(config['domain_tags'])
+        vocabulary_domains = config['domain_tags_set']
         for category, idx, rule in all_rules:
-            if 'domain' in rule and rule['domain'] not in vocabulary_domains:
+            if 'domain' in rule and (not isinstance(rule['domain'], Hashable) or rule['domain'] not in vocabulary_domains):
                 warnings.append({
                     'severity': 'MEDIUM',
                     'category': category,
@@ -294,19 +334,25 @@ def validate_quality(chatlog):
     """
     warnings = []
 
-    # Collect all constraints
-    constraints = []
-    if 'rules' in chatlog and 'constraints' in chatlog['rules']:
-        for idx, rule in enumerate(chatlog['rules']['constraints']):
-            constraints.append((idx, rule))
+    # Topic and rationale text for every rule, built once and shared by the
+    # CAP-061 through CAP-063 checks below
+    rule_texts = []
+    for category in ['decisions', 'constraints', 'invariants']:
+        if 'rules' not in chatlog or category not in chatlog['rules']:
+            continue
+
+        for idx, rule in enumerate(chatlog['rules'][category]):
+            if 'topic' not in rule and 'rationale' not in rule:
+                continue
+
+            text = rule.get('topic', '') + ' ' + rule.get('rationale', '')
+            rule_texts.append((category, idx, text, text.lower()))
 
     # CAP-061: Detect multi-behavior patterns in constraints
-    for idx, rule in constraints:
-        if 'topic' not in rule and 'rationale' not in rule:
+    for category, idx, _, text in rule_texts:
+        if category != 'constraints':
             continue
 
-        text = (rule.get('topic', '') + ' ' + rule.get('rationale', '')).lower()
-
         # High severity patterns
         if 'and also' in text:
             warnings.append({
@@ -340,47 +386,27 @@ def validate_quality(chatlog):
             })
 
     # CAP-062: Detect temporal language patterns
-    temporal_patterns = ['was ', 'were ', 'Phase ', 'completed', 'during ', 'after ']
-
-    for category in ['decisions', 'constraints', 'invariants']:
-        if 'rules' not in chatlog or category not in chatlog['rules']:
-            continue
-
-        for idx, rule in enumerate(chatlog['rules'][category]):
-            if 'topic' not in rule and 'rationale' not in rule:
-                continue
-
-            text = rule.get('topic', '') + ' ' + rule.get('rationale', '')
-
-            for pattern in temporal_patterns:
-                if pattern in text:
-                    warnings.append({
-                        'severity': 'MEDIUM',
-                        'category': category,
-                        'index': idx,
-                        'message': f"[MEDIUM] Rule at {category} index {idx}: Temporal language detected (contains '{pattern.strip()}'). May indicate lifecycle candidate."
-                    })
-                    break  # Only report once per rule
-
-    # CAP-063: Detect cross-domain boundary violations
-    for category in ['decisions', 'constraints', 'invariants']:
-        if 'rules' not in chatlog or category not in chatlog['rules']:
-            continue
-
-        for idx, rule in enumerate(chatlog['rules'][category]):
-            if 'topic' not in rule and 'rationale' not in rule:
-                continue
-
-            text = (rule.get('topic', '') + ' ' + rule.get('rationale', '')).lower()
-
-            # System Domain (model/) should not reference Build Domain (build/ or context engine)
-            if 'model/' in text and ('build/' in text or 'context engine' in text):
+    for category, idx, text, _ in rule_texts:
+        for pattern, name in TEMPORAL_PATTERNS:
+            if pattern in text:
                 warnings.append({
-                    'severity': 'HIGH',
+                    'severity': 'MEDIUM',
                     'category': category,
                     'index': idx,
-                    'message': f"[HIGH] Rule at {category} index {idx}: Cross-domain boundary violation (references both model/ and build/context engine). See CON-00056."
+                    'message': f"[MEDIUM] Rule at {category} index {idx}: Temporal language detected (contains '{name}'). May indicate lifecycle candidate."
                 })
+                break  # Only report once per rule
+
+    # CAP-063: Detect cross-domain boundary violations
+    for category, idx, _, text in rule_texts:
+        # System Domain (model/) should not reference Build Domain (build/ or context engine)
+        if 'model/' in text and ('build/' in text or 'context engine' in text):
+            warnings.append({
+                'severity': 'HIGH',
+                'category': category,
+                'index': idx,
+                'message': f"[HIGH] Rule at {category} index {idx}: Cross-domain boundary violation (references both model/ and build/context engine). See CON-00056."
+            })
 
     return warnings
 
@@ -400,6 +426,10 @@ def remediate_errors(chatlog, errors, config):
     """
     fixes_applied = []
 
+    # FUZZY_MATCH_DOMAIN results keyed by misspelled domain; rules that share
+    # a typo reuse the first lookup
+    domain_matches = {}
+
     for error in errors:
         pattern_applied = None
         fix_details = {
@@ -415,8 +445,16 @@ def remediate_errors(chatlog, errors, config):
             rule = chatlog['rules'][category][idx]
             old_domain = rule['domain']
 
-            # Use difflib to find closest match
-            matches = difflib.get_close_matches(old_domain, config['domain_tags'], n=1, cutoff=0.6)
+            # Use difflib to find closest match; imported here since only
+            # remediation runs need it
+            import difflib
+
+            cacheable = isinstance(old_domain, Hashable)
+            matches = domain_matches.get(old_domain) if cacheable else None
+            if matches is None:
+                matches = difflib.get_close_matches(old_domain, config['domain_tags'], n=1, cutoff=0.6)
+                if cacheable:
+                    domain_matches[old_domain] = matches
             if matches:
                 new_domain = matches[0]
                 rule['domain'] = new_domain
@@ -446,6 +484,8 @@ def remediate_errors(chatlog, errors, config):
 
         # PATTERN 3: REGENERATE_UUID
         elif error['error_type'] == 'invalid_format' and error['field'] == 'chatlog_id':
+            import uuid
+
             new_uuid = str(uuid.uuid4())
             old_uuid = chatlog.get('chatlog_id', 'missing')
             chatlog['chatlog_id'] = new_uuid
@@ -455,7 +495,11 @@ def remediate_errors(chatlog, errors, config):
 
         # PATTERN 4: REGENERATE_TIMESTAMP
         elif error['error_type'] == 'invalid_format' and error['field'] == 'timestamp':
-            new_timestamp = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+            # Formatted from gmtime directly; datetime.utcnow() is deprecated
+            now = time.gmtime()
+            new_timestamp = '%04d-%02d-%02dT%02d:%02d:%02dZ' % (
+                now.tm_year, now.tm_mon, now.tm_mday, now.tm_hour, now.tm_min, now.tm_sec
+            )
             old_timestamp = chatlog.get('timestamp', 'missing')
             chatlog['timestamp'] = new_timestamp
             pattern_applied = 'REGENERATE_TIMESTAMP'
@@ -521,7 +565,7 @@ def validate_chatlog_file(chatlog_path, config, debug_mode=False, remediate=Fals
     # Load chatlog YAML
     try:
         with open(chatlog_path) as f:
-            chatlog = yaml.safe_load(f)
+            chatlog = yaml.load(f, Loader=YAML_LOADER)
     except FileNotFoundError:
         return {
             'success': False,
@@ -537,6 +581,21 @@ def validate_chatlog_file(chatlog_path, config, debug_mode=False, remediate=Fals
             'exit_code': 2
         }
 
+    # Without remediation the chatlog is validated exactly once
+    if not remediate:
+        errors, schema_warnings = validate_schema(chatlog, config, debug_mode)
+        quality_warnings = [] if errors else validate_quality(chatlog)
+
+        return {
+            'success': not errors,
+            'file': str(chatlog_path.resolve()),
+            'attempts': 1,
+            'fixes_applied': [],
+            'warnings': schema_warnings + quality_warnings,
+            'errors': errors,
+            'exit_code': 1 if errors else 0
+        }
+
     all_fixes = []
     attempt = 0
 
@@ -556,6 +615,11 @@ def validate_chatlog_file(chatlog_path, config, debug_mode=False, remediate=Fals
 
         # If no errors, validation passed
         if not errors:
+            # Save remediated chatlog once, after the final pass
+            if all_fixes:
+                with open(chatlog_path, 'w') as f:
+                    yaml.dump(chatlog, f, Dumper=YAML_DUMPER, default_flow_style=False, sort_keys=False, allow_unicode=True)
+
             return {
                 'success': True,
                 'file': str(chatlog_path.resolve()),
@@ -566,18 +630,6 @@ def validate_chatlog_file(chatlog_path, config, debug_mode=False, remediate=Fals
                 'exit_code': 0
             }
 
-        # If remediate mode disabled, return errors
-        if not remediate:
-            return {
-                'success': False,
-                'file': str(chatlog_path.resolve()),
-                'attempts': attempt,
-                'fixes_applied': [],
-                'warnings': all_warnings,
-                'errors': errors,
-                'exit_code': 1
-            }
-
         # Apply remediation patterns (CAP-089)
         fixes = remediate_errors(chatlog, errors, config)
         all_fixes.extend(fixes)
@@ -586,24 +638,24 @@ def validate_chatlog_file(chatlog_path, config, debug_mode=False, remediate=Fals
         if not fixes:
             break
 
-        # Save modified chatlog for next iteration
+    # Failed after max attempts
+    # Serialize once; the same text backs both the saved chatlog and .invalid
+    chatlog_text = yaml.dump(chatlog, Dumper=YAML_DUMPER, default_flow_style=False, sort_keys=False, allow_unicode=True)
+
+    # Save whatever fixes were applied before giving up
+    if all_fixes:
         with open(chatlog_path, 'w') as f:
-            yaml.dump(chatlog, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+            f.write(chatlog_text)
 
-    # Failed after max attempts
     # CAP-048: Save as .invalid with error comments
     invalid_path = chatlog_path.with_suffix('.invalid')
 
     # Create error header
-    error_header = "# VALIDATION FAILED\n# Errors:\n"
-    for error in errors:
-        error_header += f"#   {error['message']}\n"
-    error_header += "\n"
+    error_header = "".join(f"#   {error['message']}\n" for error in errors)
 
-    # Write invalid file with error header
+    # Write invalid file with error header in a single write
     with open(invalid_path, 'w') as f:
-        f.write(error_header)
-        yaml.dump(chatlog, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+        f.write(f"# VALIDATION FAILED\n# Errors:\n{error_header}\n{chatlog_text}")
 
     return {
         'success': False,
@@ -0,0 +1,141 @@
+"""
+Shared vocabulary curation helpers for tags-review.py, tags-check.py and tags-stats.py
+
+Implements constraints: VOCAB-020, VOCAB-031, VOCAB-038
+"""
+
+from collections import defaultdict
+
+import yaml
+
+
+# LibYAML-backed loader and dumper when PyYAML was built with it,
+# pure-Python otherwise
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# rule_tags lookup table from schema/schema.sql, created and backfilled on
+# databases initialized before it was added. The write lock is taken up front
+# and the backfill starts from an empty table, so a second migration racing
+# past the existence check in ensure_rule_tags rebuilds rather than
+# duplicates rows.
+RULE_TAGS_MIGRATION = """
+BEGIN IMMEDIATE;
+
+CREATE TABLE IF NOT EXISTS rule_tags (
+  rule_id TEXT NOT NULL,
+  tag TEXT NOT NULL,
+  FOREIGN KEY(rule_id) REFERENCES rules(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_rule_tags_tag ON rule_tags(tag);
+CREATE INDEX IF NOT EXISTS idx_rule_tags_rule ON rule_tags(rule_id);
+
+CREATE TRIGGER IF NOT EXISTS trg_rules_tags_insert AFTER INSERT ON rules
+BEGIN
+  INSERT INTO rule_tags (rule_id, tag)
+  SELECT NEW.id, value FROM json_each(CASE WHEN json_valid(NEW.tags) THEN NEW.tags END)
+  WHERE value IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rules_tags_update AFTER UPDATE OF id, tags ON rules
+BEGIN
+  DELETE FROM rule_tags WHERE rule_id = OLD.id;
+  INSERT INTO rule_tags (rule_id, tag)
+  SELECT NEW.id, value FROM json_each(CASE WHEN json_valid(NEW.tags) THEN NEW.tags END)
+  WHERE value IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rules_tags_delete AFTER DELETE ON rules
+BEGIN
+  DELETE FROM rule_tags WHERE rule_id = OLD.id;
+END;
+
+DELETE FROM rule_tags;
+
+INSERT INTO rule_tags (rule_id, tag)
+SELECT rules.id, json_each.value
+FROM rules, json_each(CASE WHEN json_valid(rules.tags) THEN rules.tags END)
+WHERE json_each.value IS NOT NULL;
+
+COMMIT;
+"""
+
+
+def ensure_rule_tags(conn):
+    """Create and backfill the rule_tags lookup table and idx_rules_tagged if the database predates them."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rule_tags'")
+    if cursor.fetchone() is None:
+        conn.executescript(RULE_TAGS_MIGRATION)
+
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_rules_tagged ON rules(id) "
+        "WHERE tags IS NOT NULL AND tags != '[]'"
+    )
+
+
+def get_database_statistics(conn):
+    """VOCAB-038: Query database statistics using shared helper function."""
+    cursor = conn.cursor()
+
+    # Total rules, rules with non-empty tags, and unique tags in one statement;
+    # each count is answered from an index rather than the rules rows
+    cursor.execute("""
+        SELECT
+            (SELECT COUNT(*) FROM rules),
+            (SELECT COUNT(*) FROM rules WHERE tags IS NOT NULL AND tags != '[]'),
+            (SELECT COUNT(DISTINCT tag) FROM rule_tags)
+    """)
+    total_rules, tagged_rules, unique_tags = cursor.fetchone()
+
+    return {
+        'total_rules': total_rules,
+        'tagged_rules': tagged_rules,
+        'unique_tags': unique_tags
+    }
+
+
+def load_vocabulary(vocab_path):
+    """VOCAB-019: Query current vocabulary state from filesystem."""
+    with open(vocab_path) as f:
+        return yaml.load(f, Loader=YAML_LOADER)
+
+
+def detect_typos(vocab):
+    """VOCAB-020: Detect typos using edit distance = 1."""
+    tier_2_tags = vocab.get('tier_2_tags', {})
+    typos = []
+
+    # Find tier-2 tag pairs within each domain
+    for domain, tags in tier_2_tags.items():
+        if not tags:
+            continue
+
+        # Tags at edit distance 1 share a single-character deletion: at the
+        # same position for a substitution, or the shorter tag itself for an
+        # insertion. Indexing deletions finds those pairs without comparing
+        # every tag against every other.
+        substitutions = defaultdict(list)
+        deletions = defaultdict(list)
+        for index, tag in enumerate(tags):
+            for k in range(len(tag)):
+                deleted = tag[:k] + tag[k+1:]
+                substitutions[(deleted, k)].append(index)
+                deletions[deleted].append(index)
+
+        pairs = set()
+        for group in substitutions.values():
+            for n, i in enumerate(group):
+                for j in group[n+1:]:
+                    if tags[i] != tags[j]:
+                        pairs.add((i, j))
+        for i, tag in enumerate(tags):
+            for j in deletions.get(tag, ()):
+                pairs.add((min(i, j), max(i, j)))
+
+        # Report pairs in vocabulary order
+        for i, j in sorted(pairs):
+            typos.append((domain, tags[i], tags[j]))
+
+    return typos